@@ -1,18 +1,46 @@
 import os
+import queue
 import re
+import string
 import sys
 import threading
 import time
+import traceback
 import uuid
 import webbrowser
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import parse_qs, urlparse
 
 from flask import Flask, jsonify, request, send_file, send_from_directory
+from flask.json.provider import JSONProvider
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 app = Flask(__name__)
+# Every POST endpoint takes a small JSON body; reject anything larger before parsing it.
+app.config["MAX_CONTENT_LENGTH"] = 32 * 1024
+# Let browsers cache the logo/favicon instead of re-reading them from disk on every page load.
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 86400
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 if getattr(sys, "frozen", False):
     ASSET_DIR = Path(getattr(sys, "_MEIPASS", Path(sys.executable).resolve().parent))
@@ -24,10 +52,95 @@ else:
 DOWNLOAD_DIR = BASE_DIR / "downloads"
 DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-jobs = {}
-jobs_lock = threading.Lock()
-
-
+MAX_DOWNLOADS = max(1, int(os.environ.get("MAX_DOWNLOADS", "4")))
+download_queue = queue.Queue()
+
+JOB_SHARD_COUNT = 16
+job_shards = tuple(({}, threading.Lock()) for _ in range(JOB_SHARD_COUNT))
+# yt-dlp calls progress hooks per chunk; the UI polls far less often than that.
+PROGRESS_UPDATE_INTERVAL = 0.1
+# Finished jobs are forgotten after an hour so a long-running app does not grow without bound.
+FINISHED_JOB_STATUSES = frozenset({"completed", "error"})
+JOB_TTL_SECONDS = 3600
+JOB_SWEEP_INTERVAL = 60
+
+known_dirs = set()
+known_dirs_lock = threading.Lock()
+
+YOUTUBE_HOSTS = frozenset({"youtube.com", "m.youtube.com"})
+TIKTOK_HOSTS = frozenset({"tiktok.com", "m.tiktok.com", "vm.tiktok.com", "vt.tiktok.com"})
+INSTAGRAM_HOSTS = frozenset({"instagram.com", "m.instagram.com"})
+YOUTU_BE_HOST = "youtu.be"
+
+_URL_PARTS_RE = re.compile(
+    r"^(?:https?://)?(?:www\.)?(?P<host>[^/?#]*)(?P<path>[^?#]*)(?:\?(?P<query>[^#]*))?",
+    re.IGNORECASE,
+)
+_WATCH_VIDEO_ID_RE = re.compile(r"(?:^|&)v=[^&]")
+
+_SAFE_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "._ -")
+_SAFE_NAME_TRANS = str.maketrans({c: "_" for c in map(chr, range(128)) if c not in _SAFE_NAME_CHARS})
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._ -]")
+
+BASE_YDL_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "noplaylist": True,
+}
+FETCH_INFO_YDL_OPTS = {**BASE_YDL_OPTS, "extract_flat": False}
+SOCIAL_YDL_OPTS = {
+    **BASE_YDL_OPTS,
+    "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
+    "merge_output_format": "mp4",
+}
+MP3_POSTPROCESSORS = (
+    {
+        "key": "FFmpegExtractAudio",
+        "preferredcodec": "mp3",
+        "preferredquality": "320",
+    },
+)
+
+_NUMBER_STRIP_TRANS = str.maketrans("", "", ",%$")
+
+METRIC_KEYS = (
+    "views",
+    "likes",
+    "dislikes",
+    "ctr",
+    "avd",
+    "apv",
+    "impressions",
+    "unique_viewers",
+    "watch_time",
+    "shares",
+    "comments",
+    "subs_gained",
+    "subs_lost",
+    "returning_viewers",
+    "new_viewers",
+    "end_screen_ctr",
+    "card_teaser_clicks",
+    "rpm",
+    "cpm",
+    "playback_cpm",
+    "estimated_revenue",
+    "audience_retention",
+    "relative_retention",
+    "sub_to_view_ratio",
+    "engagement_rate",
+)
+
+DOWNLOAD_ERROR_MESSAGES = (
+    (
+        "Sign in to confirm your age",
+        "This video is age-restricted and cannot be downloaded without authentication.",
+    ),
+)
+
+
+# FFMPEG_LOCATION and the WinGet install are only probed once; restart the app to pick up changes.
+@lru_cache(maxsize=1)
 def detect_ffmpeg_bin_dir() -> str | None:
     env_dir = os.environ.get("FFMPEG_LOCATION")
     if env_dir and Path(env_dir).exists():
@@ -42,10 +155,18 @@ def detect_ffmpeg_bin_dir() -> str | None:
         / "Packages"
         / "Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe"
     )
-    if winget_root.exists():
-        matches = list(winget_root.glob("**/bin/ffmpeg.exe"))
-        if matches:
-            return str(matches[0].parent)
+    if winget_root.is_dir():
+        # WinGet unpacks FFmpeg as <package>/<build dir>/bin/ffmpeg.exe, so one level is enough.
+        try:
+            with os.scandir(winget_root) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    bin_dir = os.path.join(entry.path, "bin")
+                    if os.path.isfile(os.path.join(bin_dir, "ffmpeg.exe")):
+                        return bin_dir
+        except OSError:
+            pass
 
     return None
 
@@ -61,62 +182,121 @@ def parse_duration(seconds: int | None) -> str:
     return f"{m:d}:{s:02d}"
 
 
+def job_shard(job_id: str) -> tuple[dict, threading.Lock]:
+    return job_shards[hash(job_id) & (JOB_SHARD_COUNT - 1)]
+
+
+def get_job(job_id: str) -> dict | None:
+    shard, lock = job_shard(job_id)
+    with lock:
+        job = shard.get(job_id)
+        return dict(job) if job else None
+
+
 def update_job(job_id: str, **kwargs):
-    with jobs_lock:
-        if job_id in jobs:
-            jobs[job_id].update(kwargs)
+    if kwargs.get("status") in FINISHED_JOB_STATUSES:
+        kwargs["finished_at"] = time.time()
+    shard, lock = job_shard(job_id)
+    with lock:
+        if job_id in shard:
+            shard[job_id].update(kwargs)
+
+
+def sweep_jobs():
+    while True:
+        time.sleep(JOB_SWEEP_INTERVAL)
+        cutoff = time.time() - JOB_TTL_SECONDS
+        for shard, lock in job_shards:
+            with lock:
+                expired = [
+                    job_id
+                    for job_id, job in shard.items()
+                    if job["finished_at"] is not None and job["finished_at"] < cutoff
+                ]
+                for job_id in expired:
+                    del shard[job_id]
+
+
+threading.Thread(target=sweep_jobs, name="job-sweeper", daemon=True).start()
+
 
+def submit_download(target, job_id: str, *args):
+    download_queue.put((target, job_id, args))
 
+
+def download_worker():
+    while True:
+        target, job_id, args = download_queue.get()
+        try:
+            target(job_id, *args)
+        except Exception as exc:
+            traceback.print_exc()
+            update_job(job_id, status="error", error=str(exc), progress=0)
+
+
+# Daemon workers, like the per-download threads they replace, so closing the app never waits on downloads.
+for worker_index in range(MAX_DOWNLOADS):
+    threading.Thread(target=download_worker, name=f"download-{worker_index}", daemon=True).start()
+
+
+def friendly_download_error(exc: DownloadError) -> str:
+    msg = str(exc)
+    for needle, friendly in DOWNLOAD_ERROR_MESSAGES:
+        if needle in msg:
+            return friendly
+    return msg
+
+
+@lru_cache(maxsize=2048)
+def url_parts(url: str) -> tuple[str, str, str]:
+    match = _URL_PARTS_RE.match(url)
+    return match["host"].lower(), match["path"], match["query"] or ""
+
+
+@lru_cache(maxsize=2048)
 def is_valid_youtube_url(url: str) -> bool:
     if not url:
         return False
-    parsed = urlparse(url if "://" in url else f"https://{url}")
-    host = (parsed.netloc or "").lower().replace("www.", "")
+    host, path, query = url_parts(url)
 
-    if host == "youtu.be":
-        return bool(parsed.path.strip("/"))
+    if host == YOUTU_BE_HOST:
+        return bool(path.strip("/"))
 
-    if host in {"youtube.com", "m.youtube.com"}:
-        if parsed.path == "/watch":
-            return "v" in parse_qs(parsed.query)
-        if parsed.path.startswith("/shorts/"):
-            return bool(parsed.path.split("/shorts/", 1)[1])
+    if host in YOUTUBE_HOSTS:
+        if path == "/watch":
+            return bool(_WATCH_VIDEO_ID_RE.search(query))
+        if path.startswith("/shorts/"):
+            return len(path) > len("/shorts/")
         return False
 
     return False
 
 
+@lru_cache(maxsize=2048)
 def is_valid_tiktok_url(url: str) -> bool:
     if not url:
         return False
-    parsed = urlparse(url if "://" in url else f"https://{url}")
-    host = (parsed.netloc or "").lower().replace("www.", "")
-    if host in {"tiktok.com", "m.tiktok.com", "vm.tiktok.com", "vt.tiktok.com"}:
-        return bool(parsed.path.strip("/"))
-    return False
+    host, path, _ = url_parts(url)
+    return host in TIKTOK_HOSTS and bool(path.strip("/"))
 
 
+@lru_cache(maxsize=2048)
 def is_valid_instagram_url(url: str) -> bool:
     if not url:
         return False
-    parsed = urlparse(url if "://" in url else f"https://{url}")
-    host = (parsed.netloc or "").lower().replace("www.", "")
-    if host not in {"instagram.com", "m.instagram.com"}:
-        return False
-    path = parsed.path or ""
-    return path.startswith("/reel/") or path.startswith("/p/") or path.startswith("/tv/")
+    host, path, _ = url_parts(url)
+    return host in INSTAGRAM_HOSTS and path.startswith(("/reel/", "/p/", "/tv/"))
 
 
 def safe_float(value) -> float | None:
     if value is None or value == "":
         return None
-    if isinstance(value, (int, float)):
+    try:
         return float(value)
-    text = str(value).strip().replace(",", "")
-    text = text.replace("%", "")
-    text = text.replace("$", "")
+    except (TypeError, ValueError):
+        pass
     try:
-        return float(text)
+        return float(str(value).strip().translate(_NUMBER_STRIP_TRANS))
     except ValueError:
         return None
 
@@ -141,7 +321,7 @@ def score_lower_better(value: float | None, good: float, ok: float) -> int | Non
     return 45
 
 
-def get_format_selector(fmt: str, quality: str, sound_on: bool) -> str:
+def build_format_selector(fmt: str, quality: str, sound_on: bool) -> str:
     quality_map = {
         "360p": "360",
         "720p": "720",
@@ -182,12 +362,34 @@ def get_format_selector(fmt: str, quality: str, sound_on: bool) -> str:
     return f"bestvideo[ext=mp4][height<={max_h}]/bestvideo[height<={max_h}]"
 
 
+FORMAT_SELECTORS = {
+    (fmt, quality, sound_on): build_format_selector(fmt, quality, sound_on)
+    for fmt in ("mp4", "mp3")
+    for quality in ("360p", "720p", "1080p60")
+    for sound_on in (True, False)
+}
+
+
+def get_format_selector(fmt: str, quality: str, sound_on: bool) -> str:
+    selector = FORMAT_SELECTORS.get((fmt, quality, bool(sound_on)))
+    if selector is None:
+        # Unknown combination: let the builder raise the matching ValueError.
+        return build_format_selector(fmt, quality, sound_on)
+    return selector
+
+
 def sanitize_file_basename(name: str | None) -> str | None:
     if name is None:
         return None
     text = str(name).strip()
-    text = Path(text).stem if Path(text).suffix else text
-    safe = re.sub(r"[^A-Za-z0-9._ -]", "_", text).strip(" .")
+    if "." in text:
+        path = Path(text)
+        if path.suffix:
+            text = path.stem
+    safe = text.translate(_SAFE_NAME_TRANS)
+    if not safe.isascii():
+        safe = _UNSAFE_NAME_RE.sub("_", safe)
+    safe = safe.strip(" .")
     return safe or None
 
 
@@ -207,27 +409,42 @@ def resolve_output_path(info: dict, fmt: str, download_dir: Path, preferred_base
     return download_dir / f"{safe}.{ext}"
 
 
-def run_download_job(
+def ensure_dir(path: Path):
+    key = str(path)
+    if key in known_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    with known_dirs_lock:
+        known_dirs.add(key)
+
+
+def find_latest_by_prefix(directory: Path, prefix: str) -> Path | None:
+    latest = None
+    latest_mtime = -1.0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith(prefix) or not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime > latest_mtime:
+                latest, latest_mtime = entry.path, mtime
+    return Path(latest) if latest else None
+
+
+def run_ydl_job(
     job_id: str,
     url: str,
+    ydl_opts: dict,
     fmt: str,
-    quality: str,
-    sound_on: bool,
     output_dir: str | None,
     output_name: str | None,
 ):
-    try:
-        format_selector = get_format_selector(fmt, quality, sound_on)
-    except ValueError as exc:
-        update_job(job_id, status="error", error=str(exc), progress=0)
-        return
-
     target_dir = DOWNLOAD_DIR
     if output_dir:
         target_dir = Path(output_dir).expanduser()
 
     try:
-        target_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(target_dir)
     except Exception as exc:
         update_job(job_id, status="error", error=f"Cannot create download folder: {exc}", progress=0)
         return
@@ -235,41 +452,31 @@ def run_download_job(
     safe_name = sanitize_file_basename(output_name) or job_id
     outtmpl = str(target_dir / f"{safe_name}.%(ext)s")
 
+    last_pct = 0
+    last_update = 0.0
+
     def hook(d):
+        nonlocal last_pct, last_update
         status = d.get("status")
         if status == "downloading":
             total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
             downloaded = d.get("downloaded_bytes") or 0
             if total > 0:
-                pct = int((downloaded / total) * 100)
-                update_job(job_id, progress=max(1, min(pct, 99)))
+                pct = max(1, min(int((downloaded / total) * 100), 99))
+                now = time.monotonic()
+                if pct > last_pct and now - last_update >= PROGRESS_UPDATE_INTERVAL:
+                    last_pct = pct
+                    last_update = now
+                    update_job(job_id, progress=pct)
         elif status == "finished":
             update_job(job_id, progress=98)
 
-    ydl_opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "noplaylist": True,
-        "format": format_selector,
-        "outtmpl": outtmpl,
-        "progress_hooks": [hook],
-    }
+    ydl_opts = {**ydl_opts, "outtmpl": outtmpl, "progress_hooks": [hook]}
 
     ffmpeg_bin_dir = detect_ffmpeg_bin_dir()
     if ffmpeg_bin_dir:
         ydl_opts["ffmpeg_location"] = ffmpeg_bin_dir
 
-    if fmt == "mp3":
-        ydl_opts["postprocessors"] = [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "320",
-            }
-        ]
-    elif fmt == "mp4" and sound_on:
-        ydl_opts["merge_output_format"] = "mp4"
-
     try:
         with YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
@@ -277,9 +484,7 @@ def run_download_job(
         final_path = resolve_output_path(info, fmt, target_dir, preferred_base=safe_name)
 
         if not final_path.exists():
-            candidates = sorted(target_dir.glob(f"{safe_name}.*"), key=lambda p: p.stat().st_mtime, reverse=True)
-            if candidates:
-                final_path = candidates[0]
+            final_path = find_latest_by_prefix(target_dir, f"{safe_name}.") or final_path
 
         if not final_path.exists():
             raise FileNotFoundError("Download finished but output file was not found.")
@@ -293,157 +498,107 @@ def run_download_job(
             saved_dir=str(final_path.parent),
         )
     except DownloadError as exc:
-        msg = str(exc)
-        if "Sign in to confirm your age" in msg:
-            msg = "This video is age-restricted and cannot be downloaded without authentication."
-        update_job(job_id, status="error", error=msg, progress=0)
+        update_job(job_id, status="error", error=friendly_download_error(exc), progress=0)
     except Exception as exc:
         update_job(job_id, status="error", error=str(exc), progress=0)
 
 
-def run_social_download_job(job_id: str, url: str, output_dir: str | None, output_name: str | None):
-    target_dir = DOWNLOAD_DIR
-    if output_dir:
-        target_dir = Path(output_dir).expanduser()
-
+def run_download_job(
+    job_id: str,
+    url: str,
+    fmt: str,
+    quality: str,
+    sound_on: bool,
+    output_dir: str | None,
+    output_name: str | None,
+):
     try:
-        target_dir.mkdir(parents=True, exist_ok=True)
-    except Exception as exc:
-        update_job(job_id, status="error", error=f"Cannot create download folder: {exc}", progress=0)
+        format_selector = get_format_selector(fmt, quality, sound_on)
+    except ValueError as exc:
+        update_job(job_id, status="error", error=str(exc), progress=0)
         return
 
-    safe_name = sanitize_file_basename(output_name) or job_id
-    outtmpl = str(target_dir / f"{safe_name}.%(ext)s")
-
-    def hook(d):
-        status = d.get("status")
-        if status == "downloading":
-            total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
-            downloaded = d.get("downloaded_bytes") or 0
-            if total > 0:
-                pct = int((downloaded / total) * 100)
-                update_job(job_id, progress=max(1, min(pct, 99)))
-        elif status == "finished":
-            update_job(job_id, progress=98)
+    ydl_opts = BASE_YDL_OPTS.copy()
+    ydl_opts["format"] = format_selector
 
-    ydl_opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "noplaylist": True,
-        "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
-        "outtmpl": outtmpl,
-        "progress_hooks": [hook],
-        "merge_output_format": "mp4",
-    }
+    if fmt == "mp3":
+        ydl_opts["postprocessors"] = list(MP3_POSTPROCESSORS)
+    elif fmt == "mp4" and sound_on:
+        ydl_opts["merge_output_format"] = "mp4"
 
-    ffmpeg_bin_dir = detect_ffmpeg_bin_dir()
-    if ffmpeg_bin_dir:
-        ydl_opts["ffmpeg_location"] = ffmpeg_bin_dir
+    run_ydl_job(job_id, url, ydl_opts, fmt, output_dir, output_name)
 
-    try:
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
 
-        final_path = resolve_output_path(info, "mp4", target_dir, preferred_base=safe_name)
+def run_social_download_job(job_id: str, url: str, output_dir: str | None, output_name: str | None):
+    run_ydl_job(job_id, url, SOCIAL_YDL_OPTS, "mp4", output_dir, output_name)
+
+
+METRIC_SPECS = (
+    ("CTR", "ctr", score_higher_better, 6.0, 3.5, "Low CTR: test 2-3 stronger title/thumbnail combinations with clearer promise."),
+    ("AVD (sec)", "avd", score_higher_better, 240, 90, "Low AVD: tighten first 30 seconds and remove slow segments."),
+    ("APV (%)", "apv", score_higher_better, 45, 30, "Low APV: improve pacing and set up stronger open loops."),
+    ("Engagement Rate (%)", "engagement_rate", score_higher_better, 4.0, 2.0, "Low engagement: ask a specific comment question and add a stronger CTA."),
+    ("Audience Retention (%)", "audience_retention", score_higher_better, 45, 30, "Low retention: inspect drop-off timestamps and trim weak sections."),
+    ("Relative Retention (%)", "relative_retention", score_higher_better, 100, 80, "Relative retention is below peers: tighten storytelling and add pattern interrupts."),
+    ("Sub-to-View Ratio (%)", "sub_to_view_ratio", score_higher_better, 1.0, 0.3, "Low subscriber conversion: explicitly state why viewers should subscribe."),
+    ("End Screen CTR (%)", "end_screen_ctr", score_higher_better, 1.0, 0.5, "Low end-screen CTR: simplify to one clear next-video recommendation."),
+    ("Shares", "shares", score_higher_better, 50, 10, "Low shares: add practical takeaways people can send to others."),
+    ("Comments", "comments", score_higher_better, 25, 5, "Low comments: pin a polarizing or specific question."),
+    ("Subscribers Gained", "subs_gained", score_higher_better, 20, 5, "Few subscribers gained: clarify channel value proposition in intro and outro."),
+    ("Subscribers Lost", "subs_lost", score_lower_better, 5, 20, "High subscriber loss: align content topic with audience expectations."),
+    ("Returning Viewers", "returning_viewers", score_higher_better, 1000, 200, "Low returning viewers: publish consistent series and recurring formats."),
+    ("New Viewers", "new_viewers", score_higher_better, 1000, 200, "Low new viewers: improve search intent alignment and topic selection."),
+    ("Card Teaser Clicks", "card_teaser_clicks", score_higher_better, 30, 8, "Low card clicks: place cards at high-retention moments."),
+    ("RPM", "rpm", score_higher_better, 4.0, 1.5, "Low RPM: target higher-intent topics and optimize audience geography."),
+    ("CPM", "cpm", score_higher_better, 8.0, 3.0, "Low CPM: adjust content niche toward stronger advertiser demand."),
+    ("Playback-based CPM", "playback_cpm", score_higher_better, 8.0, 3.0, "Low playback CPM: improve ad-friendly pacing and topic fit."),
+    ("Estimated Revenue", "estimated_revenue", score_higher_better, 100, 20, "Low revenue: focus on videos with stronger retention and ad suitability."),
+)
+
+
+def add_metric(results: list, tips: list, name: str, value, score, low_tip: str, high_tip: str | None = None):
+    if score is None:
+        results.append({"name": name, "value": value, "score": None, "rating": "No data"})
+        return
+    rating = "Excellent" if score >= 90 else "Good" if score >= 70 else "Needs Work"
+    results.append({"name": name, "value": value, "score": score, "rating": rating})
+    if score < 70:
+        tips.append(low_tip)
+    elif high_tip:
+        tips.append(high_tip)
 
-        if not final_path.exists():
-            candidates = sorted(target_dir.glob(f"{safe_name}.*"), key=lambda p: p.stat().st_mtime, reverse=True)
-            if candidates:
-                final_path = candidates[0]
 
-        if not final_path.exists():
-            raise FileNotFoundError("Download finished but output file was not found.")
+def analyze_metrics(metrics: dict) -> dict:
+    vals = {key: safe_float(metrics.get(key)) for key in METRIC_KEYS}
+    views = vals["views"]
+    likes = vals["likes"]
+    dislikes = vals["dislikes"]
+    impressions = vals["impressions"]
 
-        update_job(
-            job_id,
-            status="completed",
-            progress=100,
-            file_path=str(final_path),
-            file_name=final_path.name,
-            saved_dir=str(final_path.parent),
-        )
-    except DownloadError as exc:
-        update_job(job_id, status="error", error=str(exc), progress=0)
-    except Exception as exc:
-        update_job(job_id, status="error", error=str(exc), progress=0)
+    if views and views > 0 and vals["engagement_rate"] is None:
+        total_interactions = (likes or 0) + (vals["comments"] or 0) + (vals["shares"] or 0)
+        vals["engagement_rate"] = (total_interactions / views) * 100
 
+    if views and views > 0 and vals["sub_to_view_ratio"] is None:
+        vals["sub_to_view_ratio"] = ((vals["subs_gained"] or 0) / views) * 100
 
-def analyze_metrics(metrics: dict) -> dict:
-    views = safe_float(metrics.get("views"))
-    likes = safe_float(metrics.get("likes"))
-    dislikes = safe_float(metrics.get("dislikes"))
-    ctr = safe_float(metrics.get("ctr"))
-    avd = safe_float(metrics.get("avd"))
-    apv = safe_float(metrics.get("apv"))
-    impressions = safe_float(metrics.get("impressions"))
-    unique_viewers = safe_float(metrics.get("unique_viewers"))
-    watch_time = safe_float(metrics.get("watch_time"))
-    shares = safe_float(metrics.get("shares"))
-    comments = safe_float(metrics.get("comments"))
-    subs_gained = safe_float(metrics.get("subs_gained"))
-    subs_lost = safe_float(metrics.get("subs_lost"))
-    returning_viewers = safe_float(metrics.get("returning_viewers"))
-    new_viewers = safe_float(metrics.get("new_viewers"))
-    end_screen_ctr = safe_float(metrics.get("end_screen_ctr"))
-    card_clicks = safe_float(metrics.get("card_teaser_clicks"))
-    rpm = safe_float(metrics.get("rpm"))
-    cpm = safe_float(metrics.get("cpm"))
-    playback_cpm = safe_float(metrics.get("playback_cpm"))
-    estimated_revenue = safe_float(metrics.get("estimated_revenue"))
-    audience_retention = safe_float(metrics.get("audience_retention"))
-    relative_retention = safe_float(metrics.get("relative_retention"))
-    sub_to_view_ratio = safe_float(metrics.get("sub_to_view_ratio"))
-    engagement_rate = safe_float(metrics.get("engagement_rate"))
-
-    if views and views > 0 and engagement_rate is None:
-        total_interactions = (likes or 0) + (comments or 0) + (shares or 0)
-        engagement_rate = (total_interactions / views) * 100
-
-    if views and views > 0 and sub_to_view_ratio is None:
-        sub_to_view_ratio = ((subs_gained or 0) / views) * 100
-
-    if apv is None and avd is not None:
+    if vals["apv"] is None and vals["avd"] is not None:
         duration = safe_float(metrics.get("duration_seconds"))
         if duration and duration > 0:
-            apv = (avd / duration) * 100
+            vals["apv"] = (vals["avd"] / duration) * 100
 
     results = []
     tips = []
 
-    def add_metric(name: str, value, score, low_tip: str, high_tip: str | None = None):
-        if score is None:
-            results.append({"name": name, "value": value, "score": None, "rating": "No data"})
-            return
-        rating = "Excellent" if score >= 90 else "Good" if score >= 70 else "Needs Work"
-        results.append({"name": name, "value": value, "score": score, "rating": rating})
-        if score < 70:
-            tips.append(low_tip)
-        elif high_tip:
-            tips.append(high_tip)
-
-    add_metric("CTR", ctr, score_higher_better(ctr, 6.0, 3.5), "Low CTR: test 2-3 stronger title/thumbnail combinations with clearer promise.")
-    add_metric("AVD (sec)", avd, score_higher_better(avd, 240, 90), "Low AVD: tighten first 30 seconds and remove slow segments.")
-    add_metric("APV (%)", apv, score_higher_better(apv, 45, 30), "Low APV: improve pacing and set up stronger open loops.")
-    add_metric("Engagement Rate (%)", engagement_rate, score_higher_better(engagement_rate, 4.0, 2.0), "Low engagement: ask a specific comment question and add a stronger CTA.")
-    add_metric("Audience Retention (%)", audience_retention, score_higher_better(audience_retention, 45, 30), "Low retention: inspect drop-off timestamps and trim weak sections.")
-    add_metric("Relative Retention (%)", relative_retention, score_higher_better(relative_retention, 100, 80), "Relative retention is below peers: tighten storytelling and add pattern interrupts.")
-    add_metric("Sub-to-View Ratio (%)", sub_to_view_ratio, score_higher_better(sub_to_view_ratio, 1.0, 0.3), "Low subscriber conversion: explicitly state why viewers should subscribe.")
-    add_metric("End Screen CTR (%)", end_screen_ctr, score_higher_better(end_screen_ctr, 1.0, 0.5), "Low end-screen CTR: simplify to one clear next-video recommendation.")
-    add_metric("Shares", shares, score_higher_better(shares, 50, 10), "Low shares: add practical takeaways people can send to others.")
-    add_metric("Comments", comments, score_higher_better(comments, 25, 5), "Low comments: pin a polarizing or specific question.")
-    add_metric("Subscribers Gained", subs_gained, score_higher_better(subs_gained, 20, 5), "Few subscribers gained: clarify channel value proposition in intro and outro.")
-    add_metric("Subscribers Lost", subs_lost, score_lower_better(subs_lost, 5, 20), "High subscriber loss: align content topic with audience expectations.")
-    add_metric("Returning Viewers", returning_viewers, score_higher_better(returning_viewers, 1000, 200), "Low returning viewers: publish consistent series and recurring formats.")
-    add_metric("New Viewers", new_viewers, score_higher_better(new_viewers, 1000, 200), "Low new viewers: improve search intent alignment and topic selection.")
-    add_metric("Card Teaser Clicks", card_clicks, score_higher_better(card_clicks, 30, 8), "Low card clicks: place cards at high-retention moments.")
-    add_metric("RPM", rpm, score_higher_better(rpm, 4.0, 1.5), "Low RPM: target higher-intent topics and optimize audience geography.")
-    add_metric("CPM", cpm, score_higher_better(cpm, 8.0, 3.0), "Low CPM: adjust content niche toward stronger advertiser demand.")
-    add_metric("Playback-based CPM", playback_cpm, score_higher_better(playback_cpm, 8.0, 3.0), "Low playback CPM: improve ad-friendly pacing and topic fit.")
-    add_metric("Estimated Revenue", estimated_revenue, score_higher_better(estimated_revenue, 100, 20), "Low revenue: focus on videos with stronger retention and ad suitability.")
+    for name, key, scorer, good, ok, low_tip in METRIC_SPECS:
+        value = vals[key]
+        add_metric(results, tips, name, value, scorer(value, good, ok), low_tip)
 
     if views is not None and impressions is not None and impressions > 0:
         view_from_impressions = (views / impressions) * 100
         add_metric(
+            results,
+            tips,
             "View/Impression Ratio (%)",
             view_from_impressions,
             score_higher_better(view_from_impressions, 6.0, 3.0),
@@ -453,6 +608,8 @@ def analyze_metrics(metrics: dict) -> dict:
     if likes is not None and dislikes is not None and (likes + dislikes) > 0:
         like_ratio = (likes / (likes + dislikes)) * 100
         add_metric(
+            results,
+            tips,
             "Like Ratio (%)",
             like_ratio,
             score_higher_better(like_ratio, 95, 85),
@@ -486,7 +643,8 @@ def analyze_metrics(metrics: dict) -> dict:
 
 @app.route("/")
 def index():
-    return send_from_directory(ASSET_DIR, "index.html")
+    # The page itself is revalidated on each load (cheap 304 via ETag) so UI updates show up immediately.
+    return send_from_directory(ASSET_DIR, "index.html", max_age=0)
 
 
 @app.route("/mediaLogo.png")
@@ -507,15 +665,8 @@ def fetch_info():
     if not is_valid_youtube_url(url):
         return jsonify({"error": "Invalid YouTube URL."}), 400
 
-    opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "noplaylist": True,
-        "extract_flat": False,
-    }
-
     try:
-        with YoutubeDL(opts) as ydl:
+        with YoutubeDL(FETCH_INFO_YDL_OPTS.copy()) as ydl:
             info = ydl.extract_info(url, download=False)
 
         return jsonify(
@@ -533,10 +684,7 @@ def fetch_info():
             }
         )
     except DownloadError as exc:
-        msg = str(exc)
-        if "Sign in to confirm your age" in msg:
-            msg = "Age-restricted video detected. Sign-in/auth cookies are required."
-        return jsonify({"error": msg}), 400
+        return jsonify({"error": friendly_download_error(exc)}), 400
     except Exception as exc:
         return jsonify({"error": str(exc)}), 500
 
@@ -585,24 +733,8 @@ def start_download():
         if not output_name:
             return jsonify({"error": "Invalid output file name."}), 400
 
-    job_id = uuid.uuid4().hex
-    with jobs_lock:
-        jobs[job_id] = {
-            "status": "queued",
-            "progress": 0,
-            "error": None,
-            "file_path": None,
-            "file_name": None,
-            "saved_dir": None,
-            "created_at": time.time(),
-        }
-
-    t = threading.Thread(
-        target=run_download_job,
-        args=(job_id, url, fmt, quality, sound_on, output_dir, output_name),
-        daemon=True,
-    )
-    t.start()
+    job_id = create_job()
+    submit_download(run_download_job, job_id, url, fmt, quality, sound_on, output_dir, output_name)
 
     return jsonify({"job_id": job_id})
 
@@ -629,8 +761,9 @@ def parse_output_settings(data: dict) -> tuple[str | None, str | None, str | Non
 
 def create_job() -> str:
     job_id = uuid.uuid4().hex
-    with jobs_lock:
-        jobs[job_id] = {
+    shard, lock = job_shard(job_id)
+    with lock:
+        shard[job_id] = {
             "status": "queued",
             "progress": 0,
             "error": None,
@@ -638,6 +771,7 @@ def create_job() -> str:
             "file_name": None,
             "saved_dir": None,
             "created_at": time.time(),
+            "finished_at": None,
         }
     return job_id
 
@@ -654,12 +788,7 @@ def download_tiktok():
         return jsonify({"error": error}), 400
 
     job_id = create_job()
-    t = threading.Thread(
-        target=run_social_download_job,
-        args=(job_id, url, output_dir, output_name),
-        daemon=True,
-    )
-    t.start()
+    submit_download(run_social_download_job, job_id, url, output_dir, output_name)
     return jsonify({"job_id": job_id})
 
 
@@ -675,19 +804,23 @@ def download_instagram():
         return jsonify({"error": error}), 400
 
     job_id = create_job()
-    t = threading.Thread(
-        target=run_social_download_job,
-        args=(job_id, url, output_dir, output_name),
-        daemon=True,
-    )
-    t.start()
+    submit_download(run_social_download_job, job_id, url, output_dir, output_name)
     return jsonify({"job_id": job_id})
 
 
+@app.route("/capacity", methods=["GET"])
+def get_capacity():
+    return jsonify(
+        {
+            "max_downloads": MAX_DOWNLOADS,
+            "queued": download_queue.qsize(),
+        }
+    )
+
+
 @app.route("/progress/<job_id>", methods=["GET"])
 def get_progress(job_id: str):
-    with jobs_lock:
-        job = jobs.get(job_id)
+    job = get_job(job_id)
 
     if not job:
         return jsonify({"error": "Job not found."}), 404
@@ -709,8 +842,7 @@ def get_progress(job_id: str):
 
 @app.route("/file/<job_id>", methods=["GET"])
 def get_file(job_id: str):
-    with jobs_lock:
-        job = jobs.get(job_id)
+    job = get_job(job_id)
 
     if not job:
         return jsonify({"error": "Job not found."}), 404
@@ -722,7 +854,8 @@ def get_file(job_id: str):
     if not path.exists():
         return jsonify({"error": "File no longer exists."}), 404
 
-    return send_file(path, as_attachment=True, download_name=job.get("file_name") or path.name)
+    # max_age=0 keeps downloaded files out of the long-lived SEND_FILE_MAX_AGE_DEFAULT used for page assets.
+    return send_file(path, as_attachment=True, download_name=job.get("file_name") or path.name, max_age=0)
 
 
 if __name__ == "__main__":
@@ -735,6 +868,16 @@ if __name__ == "__main__":
         app_url = f"http://{host}:{port}"
         threading.Timer(1.0, lambda: webbrowser.open_new_tab(app_url)).start()
 
-    app.run(host=host, port=port, debug=debug_mode)
+    serve = None
+    if not debug_mode:
+        try:
+            from waitress import serve
+        except ImportError:
+            pass
+
+    if serve is not None:
+        serve(app, host=host, port=port, threads=int(os.environ.get("WEB_THREADS", "16")))
+    else:
+        app.run(host=host, port=port, debug=debug_mode, threaded=True)
 
 